@@ -1,19 +1,31 @@
 import os
+import sys
+import atexit
 import asyncio
+import threading
+import queue
+import concurrent.futures
 import httpx
 import whois
 import re
 import json
+import hashlib
+import importlib.util
+import gzip
+import codecs
+import zlib
 from datetime import datetime
 from urllib.parse import urlparse
 from duckduckgo_search import DDGS
+from cachetools import TTLCache
 
 import google.generativeai as genai
 import openai
-from flask import Flask, request, jsonify, render_template_string
+from flask import Flask, Response, request
+import orjson
 
-import pyfiglet
 import colorama
+import brotli
 from colorama import Fore, Style
 
 colorama.init(autoreset=True)
@@ -191,19 +203,14 @@ SQUATTING_KEYWORDS = [
 # API KEY LOADING
 # ==============================================================================
 
+# KEY=value lines — comments, blank lines and anything malformed simply don't match
+_KEY_LINE_RE = re.compile(r'^[ \t]*([A-Za-z_]\w*)[ \t]*=[ \t]*(.*?)[ \t]*$', re.MULTILINE)
+
 def load_api_keys(filepath="keys.txt"):
-    keys = {}
     try:
         with open(filepath, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith('#'):
-                    continue
-                try:
-                    key, value = line.split('=', 1)
-                    keys[key.strip()] = value.strip()
-                except ValueError:
-                    print(f"Warning: Skipping malformed line: {line}")
+            # One regex pass over the whole file instead of a per-line Python loop
+            keys = dict(_KEY_LINE_RE.findall(f.read()))
     except FileNotFoundError:
         print(f"{Fore.RED}Error: {filepath} not found.")
         return None
@@ -219,6 +226,15 @@ def load_api_keys(filepath="keys.txt"):
 
 
 api_keys = load_api_keys()
+
+# One pooled HTTP/2 transport shared by the OpenAI-compatible clients (ChatGPT +
+# OpenRouter) instead of each SDK client building its own. Only ever used from
+# the background event loop.
+llm_http_client = openai.DefaultAsyncHttpxClient(
+    http2=True,
+    limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+)
+
 if api_keys:
     try:
         if 'GEMINI_API' in api_keys:
@@ -232,7 +248,10 @@ if api_keys:
 
     try:
         if 'CHATGPT_API' in api_keys:
-            openai_client = openai.AsyncOpenAI(api_key=api_keys.get('CHATGPT_API'))
+            openai_client = openai.AsyncOpenAI(
+                api_key=api_keys.get('CHATGPT_API'),
+                http_client=llm_http_client,
+            )
         else:
             openai_client = None
     except Exception as e:
@@ -249,6 +268,7 @@ if api_keys:
             openrouter_client = openai.AsyncOpenAI(
                 api_key=api_keys.get('OPENROUTER_API'),
                 base_url="https://openrouter.ai/api/v1",
+                http_client=llm_http_client,
                 default_headers={
                     "HTTP-Referer": "http://localhost:5000",
                     "X-Title": "ARYPHISH_DETECTOR",
@@ -268,6 +288,44 @@ else:
     openrouter_client = None
     openrouter_model = None
 
+# ==============================================================================
+# BACKGROUND EVENT LOOP
+# ==============================================================================
+
+# One long-lived event loop on a daemon thread runs every analysis. Flask request
+# threads hand their coroutines to it instead of calling asyncio.run(), so loop
+# setup is paid once and loop-bound clients (httpx connection pools) stay reusable.
+_bg_loop = None
+_bg_loop_lock = threading.Lock()
+
+# Threads for the blocking lookups (WHOIS, DuckDuckGo, typosquat checks) that
+# analyses push off the loop. Each analysis holds one at a time; the stock
+# min(32, cpu + 4) pool is only 6-8 threads on small hosts, which would queue a
+# full batch behind itself. This covers a whole batch plus interactive requests.
+BLOCKING_IO_WORKERS = 32
+
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """Returns the shared event loop, starting its thread on first use."""
+    global _bg_loop
+    with _bg_loop_lock:
+        if _bg_loop is None:
+            _bg_loop = asyncio.new_event_loop()
+            _bg_loop.set_default_executor(concurrent.futures.ThreadPoolExecutor(
+                max_workers=BLOCKING_IO_WORKERS, thread_name_prefix="aryphish-io"
+            ))
+            threading.Thread(
+                target=_bg_loop.run_forever, name="aryphish-event-loop", daemon=True
+            ).start()
+    return _bg_loop
+
+
+def run_in_background_loop(coro, timeout=None):
+    """Submits a coroutine to the background loop and blocks until it finishes."""
+    future = asyncio.run_coroutine_threadsafe(coro, get_background_loop())
+    return future.result(timeout)
+
+
 # ==============================================================================
 # MODULE 1 — COMBO-SQUATTING & TYPOSQUATTING DETECTOR
 # ==============================================================================
@@ -843,39 +901,292 @@ def search_domain_intelligence(domain: str, brand_matches: list) -> dict:
 # MODULE 4 — WEBSITE CONTENT FETCHER
 # ==============================================================================
 
-async def fetch_website_content(url: str) -> str:
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
+FETCH_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    # gzip only — we inflate it ourselves in bounded steps (see _collect_text).
+    # br is not offered: its decoder can't cap output per call.
+    'Accept-Encoding': 'gzip',
+}
+
+# Whole-fetch deadline in seconds (connect + redirects + body), the same on both
+# HTTP backends — a server trickling bytes can't hold an analysis open
+FETCH_TIMEOUT = 10.0
+
+# Shared client for page fetches — reused across requests so repeat hosts get
+# keep-alive connections instead of a fresh TCP+TLS handshake every time.
+# HTTP/2 (negotiated via ALPN, HTTP/1.1 fallback) multiplexes redirect hops
+# to the same host over one connection.
+_http_client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Returns the shared fetch client, creating it lazily on first use.
+    Its connection pool binds to the loop it first runs on, so only call this
+    from the background event loop — the client is never swapped out.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            http1=True,
+            follow_redirects=True,
+            # Per-operation limit; the whole read is bounded by FETCH_TIMEOUT
+            timeout=FETCH_TIMEOUT,
+            # Idle connections are kept for a minute (default 5s): a re-check of
+            # the same host reuses the socket and skips DNS + handshake entirely
+            limits=httpx.Limits(
+                max_connections=100, max_keepalive_connections=20, keepalive_expiry=60.0
+            ),
+        )
+    return _http_client
+
+
+# Which HTTP stack fetches pages: httpx (default) or aiohttp.
+# Set HTTP_BACKEND=aiohttp in keys.txt to switch; aiohttp is only imported then.
+HTTP_BACKEND = (api_keys or {}).get('HTTP_BACKEND', 'httpx').lower()
+if HTTP_BACKEND not in ('httpx', 'aiohttp'):
+    print(f"{Fore.YELLOW}Warning: Unknown HTTP_BACKEND '{HTTP_BACKEND}', using httpx")
+    HTTP_BACKEND = 'httpx'
+elif HTTP_BACKEND == 'aiohttp' and importlib.util.find_spec("aiohttp") is None:
+    print(f"{Fore.YELLOW}Warning: HTTP_BACKEND=aiohttp but aiohttp is not installed, using httpx")
+    HTTP_BACKEND = 'httpx'
+
+_aiohttp_session = None
+
+
+def get_aiohttp_session():
+    """Returns the shared aiohttp session used when HTTP_BACKEND=aiohttp."""
+    global _aiohttp_session
+    if _aiohttp_session is None or _aiohttp_session.closed:
+        import aiohttp
+        # Resolved hosts are cached for 5 minutes, so re-checks of the same
+        # lookalike domains skip DNS. aiodns (if installed) resolves without
+        # tying up executor threads.
+        resolver = aiohttp.AsyncResolver() if importlib.util.find_spec("aiodns") else None
+        _aiohttp_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=100, use_dns_cache=True, ttl_dns_cache=300, resolver=resolver
+            ),
+            timeout=aiohttp.ClientTimeout(total=FETCH_TIMEOUT),
+            # Raw bytes — _collect_text inflates them in bounded steps
+            auto_decompress=False,
+        )
+    return _aiohttp_session
+
+
+def close_http_client():
+    """Closes the shared HTTP clients (page fetch + LLM) at interpreter exit."""
+    if _bg_loop is None:
+        return
+    closers = []
+    if _http_client is not None and not _http_client.is_closed:
+        closers.append(_http_client.aclose())
+    if _aiohttp_session is not None and not _aiohttp_session.closed:
+        closers.append(_aiohttp_session.close())
+    if not llm_http_client.is_closed:
+        closers.append(llm_http_client.aclose())
+    for coro in closers:
+        try:
+            run_in_background_loop(coro, timeout=5)
+        except Exception:
+            pass
+
+
+atexit.register(close_http_client)
+
+
+# Only this much of a page is ever sent to the LLMs
+MAX_HTML_CHARS = 12000
+# Max bytes inflated per decompress() call — keeps a gzip bomb from ever
+# expanding more than this much at once
+DECOMPRESS_STEP = 64 * 1024
+
+# Fetched pages keyed by URL -> (html, content digest, host the page was served
+# from after redirects). The same link is often
+# re-checked (retries, switching AI engines), so repeat lookups within the hour
+# skip the network.
+HTML_CACHE = TTLCache(maxsize=512, ttl=3600)
+
+# URL -> in-flight fetch task, so concurrent checks of one URL share a single request
+_inflight_fetches = {}
+
+
+async def _collect_text(chunks, encoding: str, content_encoding: str) -> str:
+    """
+    Inflates and decodes raw body chunks incrementally and stops reading as soon
+    as MAX_HTML_CHARS characters are in hand — multi-MB pages (or small gzip
+    bombs) are never downloaded, inflated or decoded past what the prompt can
+    use, whatever the charset's bytes/char.
+    """
+    content_encoding = (content_encoding or "identity").strip().lower()
+    if content_encoding in ("gzip", "x-gzip", "deflate"):
+        # MAX_WBITS | 32 auto-detects a gzip or zlib header
+        decompressor = zlib.decompressobj(zlib.MAX_WBITS | 32)
+    elif content_encoding == "identity":
+        decompressor = None
+    else:
+        raise Exception(f"Unsupported Content-Encoding '{content_encoding}'.")
+
     try:
-        async with httpx.AsyncClient(follow_redirects=True, timeout=10.0) as client:
-            response = await client.get(url, headers=headers)
-            response.raise_for_status()
-            return response.text
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    except LookupError:
+        # Unknown charset in Content-Type
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    parts = []
+    length = 0
+    async for chunk in chunks:
+        while chunk:
+            if decompressor is not None:
+                try:
+                    data = decompressor.decompress(chunk, DECOMPRESS_STEP)
+                except zlib.error:
+                    raise Exception("Could not decompress website content.")
+                chunk = decompressor.unconsumed_tail
+            else:
+                data, chunk = chunk, b""
+            text = decoder.decode(data)
+            parts.append(text)
+            length += len(text)
+            if length >= MAX_HTML_CHARS:
+                return "".join(parts)[:MAX_HTML_CHARS]
+
+    parts.append(decoder.decode(b"", final=True))
+    return "".join(parts)[:MAX_HTML_CHARS]
+
+
+async def _stream_page_httpx(url: str) -> tuple:
+    async with get_http_client().stream("GET", url, headers=FETCH_HEADERS) as response:
+        response.raise_for_status()
+        html = await _collect_text(
+            response.aiter_raw(),
+            response.charset_encoding or "utf-8",
+            response.headers.get("content-encoding"),
+        )
+        # Redirects are followed, so the page may come from another host
+        return html, response.url.host
+
+
+async def _read_page_httpx(url: str) -> tuple:
+    """Reads the first MAX_HTML_CHARS of a page with httpx. Returns (html, final_host)."""
+    try:
+        # httpx timeouts apply per read, so a slow drip of bytes never trips
+        # them — bound the whole fetch like aiohttp's ClientTimeout(total=...)
+        return await asyncio.wait_for(_stream_page_httpx(url), FETCH_TIMEOUT)
     except httpx.HTTPStatusError as e:
         raise Exception(f"Failed to fetch content (Status: {e.response.status_code}).")
-    except httpx.RequestError:
+    except (httpx.RequestError, asyncio.TimeoutError):
         raise Exception("Could not retrieve website content. Site may be offline or unreachable.")
 
 
+async def _read_page_aiohttp(url: str) -> tuple:
+    """Reads the first MAX_HTML_CHARS of a page with aiohttp. Returns (html, final_host)."""
+    import aiohttp
+    try:
+        async with get_aiohttp_session().get(url, headers=FETCH_HEADERS) as response:
+            response.raise_for_status()
+            html = await _collect_text(
+                response.content.iter_chunked(16384),
+                response.charset or "utf-8",
+                response.headers.get("Content-Encoding"),
+            )
+            # Redirects are followed, so the page may come from another host
+            return html, response.url.host
+    except aiohttp.ClientResponseError as e:
+        raise Exception(f"Failed to fetch content (Status: {e.status}).")
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        raise Exception("Could not retrieve website content. Site may be offline or unreachable.")
+
+
+async def _download_page(url: str) -> tuple:
+    """Downloads a page, truncates it to MAX_HTML_CHARS and stores it in HTML_CACHE."""
+    if HTTP_BACKEND == 'aiohttp':
+        html, final_host = await _read_page_aiohttp(url)
+    else:
+        html, final_host = await _read_page_httpx(url)
+
+    page = (html, hashlib.blake2b(html.encode(), digest_size=16).hexdigest(), final_host)
+    HTML_CACHE[url] = page
+    return page
+
+
+async def fetch_website_content(url: str) -> tuple:
+    """
+    Returns (html, digest, final_host): the first MAX_HTML_CHARS of a page's
+    HTML, a blake2b digest of that text used to recognise identical pages, and
+    the host that actually served it once redirects were followed.
+    Served from HTML_CACHE when possible; otherwise concurrent callers for the
+    same URL await one shared download. Failed fetches are not cached.
+    """
+    cached = HTML_CACHE.get(url)
+    if cached is not None:
+        return cached
+
+    task = _inflight_fetches.get(url)
+    if task is None:
+        task = asyncio.ensure_future(_download_page(url))
+        _inflight_fetches[url] = task
+        task.add_done_callback(lambda _: _inflight_fetches.pop(url, None))
+    # shield: one caller being cancelled must not abort the fetch for the others
+    return await asyncio.shield(task)
+
+
 # ==============================================================================
 # MODULE 5 — AI ANALYSIS FUNCTIONS
 # ==============================================================================
 
-async def analyze_with_gemini(user_prompt: str, system_prompt: str) -> str:
+# Successful LLM verdicts keyed by (engine, system prompt, cache id). Errors are
+# never cached. The cache id is either:
+#   the content key — when the page was fetched: requested host, final host and
+#       digests of the intel and of the HTML, so a hit needs the same domain
+#       with the same WHOIS/squatting/search/IP signals serving the same page
+#   a digest of the prompt — otherwise, i.e. only an identical prompt hits
+VERDICT_CACHE = TTLCache(maxsize=2048, ttl=1800)
+
+
+def _verdict_cache_id(user_prompt: str, system_prompt: str, content_key=None) -> str:
+    """
+    Returns the id an analysis's verdicts are cached under. Computed once per
+    analysis and handed to every engine, so the ~20 KB prompt is hashed once.
+    """
+    if content_key:
+        return content_key
+    return hashlib.blake2b(
+        f"{system_prompt}|{user_prompt}".encode(), digest_size=16
+    ).hexdigest()
+
+
+def _verdict_cache_key(engine: str, user_prompt: str, system_prompt: str, cache_id=None) -> tuple:
+    """Returns the cache key for one engine's answer to one analysis."""
+    return engine, system_prompt, cache_id or _verdict_cache_id(user_prompt, system_prompt)
+
+
+async def analyze_with_gemini(user_prompt: str, system_prompt: str, cache_id: str = None) -> str:
     if not gemini_model:
         return "Error: Gemini model is not configured."
+    cache_key = _verdict_cache_key("gemini", user_prompt, system_prompt, cache_id)
+    cached = VERDICT_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
     try:
         full_prompt = f"{system_prompt}\n\n---\n\n{user_prompt}"
         response = await gemini_model.generate_content_async(full_prompt)
-        return response.text
+        result = response.text
+        if result:
+            VERDICT_CACHE[cache_key] = result
+        return result
     except Exception as e:
         return f"Error during Gemini analysis: {e}"
 
 
-async def analyze_with_openai(user_prompt: str, system_prompt: str) -> str:
+async def analyze_with_openai(user_prompt: str, system_prompt: str, cache_id: str = None) -> str:
     if not openai_client:
         return "Error: OpenAI client is not configured."
+    cache_key = _verdict_cache_key("chatgpt", user_prompt, system_prompt, cache_id)
+    cached = VERDICT_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
     try:
         response = await openai_client.chat.completions.create(
             model="gpt-4o-mini",
@@ -885,7 +1196,10 @@ async def analyze_with_openai(user_prompt: str, system_prompt: str) -> str:
             ],
             temperature=0.1
         )
-        return response.choices[0].message.content
+        result = response.choices[0].message.content
+        if result:
+            VERDICT_CACHE[cache_key] = result
+        return result
     except Exception as e:
         return f"Error during OpenAI analysis: {e}"
 
@@ -915,7 +1229,7 @@ def _is_retryable_error(err_str: str) -> bool:
         return True
     return False
 
-async def analyze_with_openrouter(user_prompt: str, system_prompt: str) -> str:
+async def analyze_with_openrouter(user_prompt: str, system_prompt: str, cache_id: str = None) -> str:
     """
     Free-tier LLM via OpenRouter with smart fallback chain.
 
@@ -931,6 +1245,11 @@ async def analyze_with_openrouter(user_prompt: str, system_prompt: str) -> str:
     if not openrouter_client:
         return "Error: OpenRouter client is not configured. Add OPENROUTER_API=your_key to keys.txt"
 
+    cache_key = _verdict_cache_key("openrouter", user_prompt, system_prompt, cache_id)
+    cached = VERDICT_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
     # Build chain: user's preferred model first (if set), then auto-router, then manual fallbacks
     preferred = openrouter_model  # from keys.txt OPENROUTER_MODEL= or None
     auto_router = "openrouter/auto"
@@ -962,7 +1281,9 @@ async def analyze_with_openrouter(user_prompt: str, system_prompt: str) -> str:
 
             print(f"{Fore.GREEN}  [OpenRouter] ✓ Success with: {model}")
             # Embed model name so UI card header shows actual model used
-            return "__model__:" + model + "\n" + result
+            result = "__model__:" + model + "\n" + result
+            VERDICT_CACHE[cache_key] = result
+            return result
 
         except Exception as e:
             err_str = str(e)
@@ -982,13 +1303,118 @@ async def analyze_with_openrouter(user_prompt: str, system_prompt: str) -> str:
     )
 
 
+async def stream_with_gemini(user_prompt: str, system_prompt: str, cache_id: str = None):
+    """
+    Streaming variant of analyze_with_gemini — yields text chunks as Gemini
+    generates them. API errors are raised to the caller.
+    """
+    if not gemini_model:
+        yield "Error: Gemini model is not configured."
+        return
+    cache_key = _verdict_cache_key("gemini", user_prompt, system_prompt, cache_id)
+    cached = VERDICT_CACHE.get(cache_key)
+    if cached is not None:
+        yield cached
+        return
+
+    full_prompt = f"{system_prompt}\n\n---\n\n{user_prompt}"
+    response = await gemini_model.generate_content_async(full_prompt, stream=True)
+    parts = []
+    async for chunk in response:
+        try:
+            piece = chunk.text
+        except ValueError:
+            # Chunks without text parts (e.g. the final finish-reason chunk)
+            continue
+        if piece:
+            parts.append(piece)
+            yield piece
+    if parts:
+        VERDICT_CACHE[cache_key] = "".join(parts)
+
+
+async def stream_with_openai(user_prompt: str, system_prompt: str, cache_id: str = None):
+    """
+    Streaming variant of analyze_with_openai — yields text chunks as GPT
+    generates them. API errors are raised to the caller.
+    """
+    if not openai_client:
+        yield "Error: OpenAI client is not configured."
+        return
+    cache_key = _verdict_cache_key("chatgpt", user_prompt, system_prompt, cache_id)
+    cached = VERDICT_CACHE.get(cache_key)
+    if cached is not None:
+        yield cached
+        return
+
+    stream = await openai_client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ],
+        temperature=0.1,
+        stream=True,
+    )
+    parts = []
+    async for chunk in stream:
+        piece = chunk.choices[0].delta.content if chunk.choices else None
+        if piece:
+            parts.append(piece)
+            yield piece
+    if parts:
+        VERDICT_CACHE[cache_key] = "".join(parts)
+
+
+# Engine key (as used in ai_choice and the JSON response) -> implementation
+ENGINE_ANALYZERS = {
+    "gemini":     analyze_with_gemini,
+    "chatgpt":    analyze_with_openai,
+    "openrouter": analyze_with_openrouter,
+}
+ENGINE_STREAMERS = {
+    "gemini":     stream_with_gemini,
+    "chatgpt":    stream_with_openai,
+}
+ENGINE_LABELS = {
+    "gemini":     "Gemini",
+    "chatgpt":    "OpenAI",
+    "openrouter": "OpenRouter",
+}
+
+
+# Upper bound on LLM API calls in flight across all analyses (batches included),
+# so large fan-outs stay within provider rate limits
+MAX_CONCURRENT_LLM_CALLS = 20
+_llm_semaphore = None
+
+
+def _get_llm_semaphore() -> asyncio.Semaphore:
+    """Returns the shared LLM semaphore; only call from the background loop."""
+    global _llm_semaphore
+    if _llm_semaphore is None:
+        # Created lazily so it belongs to the background loop
+        _llm_semaphore = asyncio.Semaphore(MAX_CONCURRENT_LLM_CALLS)
+    return _llm_semaphore
+
+
+async def _with_llm_slot(coro):
+    """Awaits an LLM call once a slot under MAX_CONCURRENT_LLM_CALLS is free."""
+    async with _get_llm_semaphore():
+        return await coro
+
+
 # ==============================================================================
 # CORE ORCHESTRATOR — Assembles all modules into one enriched prompt
 # ==============================================================================
 
-async def perform_analysis(url: str, ai_choice: str, system_prompt: str):
+async def build_analysis_context(url: str):
     """
-    Orchestrates all detection modules and sends enriched context to LLMs.
+    Runs every non-LLM detection module for a URL.
+    Returns (reports, user_prompt, content_key): the report dicts shown in the
+    UI, the enriched prompt that gets sent to the LLMs, and a verdict cache key
+    built from the requested host, the final host, and digests of the intel and
+    of the fetched HTML (None if the fetch failed).
     """
     parsed = urlparse(url)
     domain = parsed.netloc or parsed.path
@@ -1023,14 +1449,14 @@ async def perform_analysis(url: str, ai_choice: str, system_prompt: str):
     # If it's a shortener, fetch the final destination URL for richer analysis
     fetch_url = shortener_report.get("final_url") or url
     try:
-        source_code = await fetch_website_content(fetch_url)
-        truncated_source = source_code[:12000]
+        truncated_source, html_digest, final_host = await fetch_website_content(fetch_url)
     except Exception as e:
         truncated_source = f"[Could not fetch HTML: {e}]"
+        html_digest = final_host = None
 
 
     # --- Build enriched prompt for LLMs ---
-    user_prompt = f"""
+    intel_prompt = f"""
 === TARGET URL ===
 {url}
 
@@ -1114,38 +1540,109 @@ Is Hosting:   {ip_report['is_hosting']}
 
 {f"Search Error: {search_intel['search_error']}" if search_intel['search_error'] else ''}
 
-=== HTML SOURCE CODE (first 12,000 chars) ===
+"""
+    user_prompt = intel_prompt + f"""=== HTML SOURCE CODE (first {MAX_HTML_CHARS:,} chars) ===
 {truncated_source}
 """
 
-    # --- Run LLM analyses in parallel ---
-    # ai_choice values: gemini | chatgpt | openrouter | all | both (legacy) | auto (server fallback)
+    # The page HTML already has a digest, so only the intel above it (URL, WHOIS,
+    # squatting, search, IP) is hashed here. Both parts are in the key: a squat
+    # domain that redirects to, or is parked on, a host analysed before shows the
+    # same HTML but different intel, and must get its own verdict.
+    if html_digest:
+        intel_digest = hashlib.blake2b(intel_prompt.encode(), digest_size=16).hexdigest()
+        content_key = f"{domain}|{final_host}|{intel_digest}|{html_digest}"
+    else:
+        content_key = None
+
+    reports = {
+        "squatting_report": squatting_report,
+        "whois_report": whois_report,
+        "ip_report": ip_report,
+        "shortener_report": shortener_report,
+        "openrouter_model": openrouter_model,
+    }
+    return reports, user_prompt, content_key
+
+
+def select_engines(ai_choice: str) -> list:
+    """Maps the UI's ai_choice to the list of engine keys to run."""
+    # ai_choice values: gemini | chatgpt | openrouter | all | both (legacy) | auto (server fallback) | fast
     # 'auto' at server level = run all configured engines
     if ai_choice == 'auto':
         ai_choice = 'all'
 
-    tasks = []
-    task_keys = []
+    # 'fast' races only configured engines — an unconfigured one would "finish"
+    # instantly with an error and just add noise
+    if ai_choice == 'fast':
+        configured = {'gemini': gemini_model, 'chatgpt': openai_client, 'openrouter': openrouter_client}
+        return [key for key, client in configured.items() if client]
 
+    engines = []
     if ai_choice in ['gemini', 'both', 'all']:
-        tasks.append(analyze_with_gemini(user_prompt, system_prompt))
-        task_keys.append('gemini')
+        engines.append('gemini')
     if ai_choice in ['chatgpt', 'both', 'all']:
-        tasks.append(analyze_with_openai(user_prompt, system_prompt))
-        task_keys.append('chatgpt')
+        engines.append('chatgpt')
     if ai_choice in ['openrouter', 'all']:
-        tasks.append(analyze_with_openrouter(user_prompt, system_prompt))
-        task_keys.append('openrouter')
+        engines.append('openrouter')
+    return engines
 
-    results = await asyncio.gather(*tasks, return_exceptions=True)
 
-    response_data = {
-        "squatting_report": squatting_report,
-        "whois_report": whois_report,
-        "ip_report": ip_report,
-        "shortener_report": shortener_report,
-        "openrouter_model": openrouter_model,
-    }
+VERDICT_RE = re.compile(r'Verdict:\s*(Safe|Phishing|Suspicious)', re.IGNORECASE)
+
+
+def _has_verdict(text) -> bool:
+    """True if an engine answer is a usable verdict (not an error message)."""
+    return isinstance(text, str) and not text.startswith("Error") and VERDICT_RE.search(text) is not None
+
+
+async def _race_for_verdict(tasks: dict) -> dict:
+    """
+    Awaits engine tasks ({engine: task}) until one returns a parseable verdict,
+    then cancels the rest so their API calls aren't paid for.
+    Returns {engine: result} for every task that finished, errors included.
+    """
+    key_of = {task: key for key, task in tasks.items()}
+    results = {}
+    pending = set(tasks.values())
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                error = task.exception()
+                results[key_of[task]] = str(error) if error else task.result()
+            if any(_has_verdict(results[key_of[task]]) for task in done):
+                break
+    finally:
+        # Losers — or everything, if we were cancelled ourselves
+        for task in pending:
+            task.cancel()
+    return results
+
+
+async def perform_analysis(url: str, ai_choice: str, system_prompt: str):
+    """
+    Orchestrates all detection modules and sends enriched context to LLMs.
+    In 'fast' mode the first engine to return a verdict wins and the others
+    are cancelled; their keys are then absent from the response.
+    """
+    response_data, user_prompt, content_key = await build_analysis_context(url)
+    cache_id = _verdict_cache_id(user_prompt, system_prompt, content_key)
+
+    # --- Run LLM analyses in parallel ---
+    task_keys = select_engines(ai_choice)
+    if ai_choice == 'fast':
+        tasks = {
+            key: asyncio.ensure_future(_with_llm_slot(ENGINE_ANALYZERS[key](user_prompt, system_prompt, cache_id)))
+            for key in task_keys
+        }
+        response_data.update(await _race_for_verdict(tasks))
+        return response_data, 200
+
+    results = await asyncio.gather(
+        *(_with_llm_slot(ENGINE_ANALYZERS[key](user_prompt, system_prompt, cache_id)) for key in task_keys),
+        return_exceptions=True,
+    )
 
     for key, result in zip(task_keys, results):
         response_data[key] = str(result) if isinstance(result, Exception) else result
@@ -1153,12 +1650,106 @@ Is Hosting:   {ip_report['is_hosting']}
     return response_data, 200
 
 
+async def _stream_engine(key: str, user_prompt: str, system_prompt: str, cache_id: str, emit):
+    """
+    Runs one engine for stream_analysis. Engines with a streaming variant emit a
+    'delta' per text chunk; every engine finishes with a 'result' event carrying
+    the full text, which replaces whatever was streamed (e.g. on a mid-stream error).
+    """
+    async with _get_llm_semaphore():
+        stream_fn = ENGINE_STREAMERS.get(key)
+        if stream_fn is None:
+            # OpenRouter walks a fallback chain, so it only reports the final answer
+            try:
+                text = await ENGINE_ANALYZERS[key](user_prompt, system_prompt, cache_id)
+            except Exception as e:
+                text = str(e)
+        else:
+            parts = []
+            try:
+                async for piece in stream_fn(user_prompt, system_prompt, cache_id):
+                    parts.append(piece)
+                    emit("delta", {"engine": key, "text": piece})
+                text = "".join(parts)
+            except Exception as e:
+                text = f"Error during {ENGINE_LABELS[key]} analysis: {e}"
+    emit("result", {"engine": key, "text": text})
+    return text
+
+
+async def stream_analysis(url: str, ai_choice: str, system_prompt: str, emit):
+    """
+    Streaming variant of perform_analysis, used by /analyze_stream.
+    Calls emit(event, payload) with:
+      'intel'  — the detection reports, as soon as they are ready
+      'delta'  — {engine, text} chunk of an LLM answer as it is generated
+      'result' — {engine, text} final answer of one engine
+      'skip'   — {engine} cancelled in 'fast' mode after another engine won
+      'error'  — {error} if the analysis failed
+      'done'   — always last
+    """
+    try:
+        reports, user_prompt, content_key = await build_analysis_context(url)
+        cache_id = _verdict_cache_id(user_prompt, system_prompt, content_key)
+        emit("intel", reports)
+        engines = select_engines(ai_choice)
+        if ai_choice == 'fast':
+            tasks = {
+                key: asyncio.ensure_future(_stream_engine(key, user_prompt, system_prompt, cache_id, emit))
+                for key in engines
+            }
+            finished = await _race_for_verdict(tasks)
+            for key in engines:
+                if key not in finished:
+                    emit("skip", {"engine": key})
+        else:
+            await asyncio.gather(
+                *(_stream_engine(key, user_prompt, system_prompt, cache_id, emit) for key in engines)
+            )
+    except Exception as e:
+        print(f"{Fore.RED}Stream analysis error: {e}")
+        emit("error", {"error": "Internal server error."})
+    emit("done", {})
+
+
+# Max URLs accepted by one /batch_analyze request
+MAX_BATCH_URLS = 20
+
+
+async def perform_analysis_batch(urls: list, ai_choice: str, system_prompt: str):
+    """
+    Runs perform_analysis for every URL concurrently — all fetches, lookups and
+    LLM calls overlap, with LLM concurrency bounded by _with_llm_slot.
+    A failure on one URL is reported in its own entry and doesn't sink the batch.
+    """
+    results = await asyncio.gather(
+        *(perform_analysis(url, ai_choice, system_prompt) for url in urls),
+        return_exceptions=True,
+    )
+
+    batch = []
+    for url, result in zip(urls, results):
+        if isinstance(result, Exception):
+            batch.append({"url": url, "error": str(result)})
+        else:
+            response_data, _ = result
+            batch.append({"url": url, **response_data})
+
+    return {"results": batch}, 200
+
+
 # ==============================================================================
 # FLASK APP
 # ==============================================================================
 
 app = Flask(__name__)
 
+
+def json_response(payload, status: int = 200):
+    """Drop-in for jsonify() that serializes with orjson (much faster on multi-KB LLM text)."""
+    return app.response_class(orjson.dumps(payload), status=status, mimetype='application/json')
+
+
 @app.route('/config')
 def get_config():
     """
@@ -1166,7 +1757,7 @@ def get_config():
     Frontend uses this to build the dropdown dynamically
     and only show engines that have valid API keys.
     """
-    return jsonify({
+    return json_response({
         "gemini":      gemini_model is not None,
         "chatgpt":     openai_client is not None,
         "openrouter":  openrouter_client is not None,
@@ -1656,6 +2247,14 @@ async function initEngineDropdown() {
             : 'Auto';
     sel.appendChild(autoOpt);
 
+    // Fast: race all available engines, keep the first verdict, cancel the rest
+    if (available.length > 1) {
+        const fastOpt = document.createElement('option');
+        fastOpt.value = 'fast';
+        fastOpt.textContent = 'Fast (first verdict wins)';
+        sel.appendChild(fastOpt);
+    }
+
     // Always show all 3 engines — disable ones that aren't configured
     const ALL_ENGINES = [
         { value: 'gemini',     label: 'Gemini',           key: 'gemini'     },
@@ -1677,7 +2276,7 @@ async function initEngineDropdown() {
 
     // Restore cookie preference (only if that engine is still available)
     const saved = getCookie(COOKIE_KEY);
-    const validValues = ['auto', ...available.map(e => e.value)];
+    const validValues = ['auto', ...(available.length > 1 ? ['fast'] : []), ...available.map(e => e.value)];
     if (saved && validValues.includes(saved)) {
         sel.value = saved;
         badge.textContent = saved === 'auto' ? '' : `[saved]`;
@@ -1802,16 +2401,36 @@ async function runAnalysis() {
     const resolvedChoice = await resolveAiChoice(document.getElementById('aiChoice').value);
 
     try {
-        const res = await fetch('/analyze', {
+        const res = await fetch('/analyze_stream', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({ url, ai_choice: resolvedChoice })
         });
-        const data = await res.json();
-        if (!res.ok) throw new Error(data.error || 'Server error');
+        if (!res.ok) {
+            const data = await res.json().catch(() => ({}));
+            throw new Error(data.error || 'Server error');
+        }
 
-        renderIntel(data);
-        renderResults(data);
+        // Render intel + verdicts incrementally as server-sent events arrive
+        const results = {};
+        await readEventStream(res, (event, data) => {
+            if (event === 'intel') {
+                results.openrouter_model = data.openrouter_model;
+                renderIntel(data);
+            } else if (event === 'delta') {
+                results[data.engine] = (results[data.engine] || '') + data.text;
+                renderResults(results);
+            } else if (event === 'result') {
+                results[data.engine] = data.text;
+                renderResults(results);
+            } else if (event === 'skip') {
+                // Fast mode: another engine answered first
+                delete results[data.engine];
+                document.getElementById(data.engine + 'Card').style.display = 'none';
+            } else if (event === 'error') {
+                throw new Error(data.error || 'Server error');
+            }
+        });
 
     } catch(e) {
         showError(e.message);
@@ -1822,6 +2441,30 @@ async function runAnalysis() {
     }
 }
 
+// ── Minimal server-sent-events reader over a fetch() response ───────────────
+// (EventSource can't POST, so frames are parsed by hand)
+async function readEventStream(res, onEvent) {
+    const reader  = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        let sep;
+        while ((sep = buffer.indexOf('\n\n')) !== -1) {
+            const frame = buffer.slice(0, sep);
+            buffer = buffer.slice(sep + 2);
+            let event = 'message', data = '';
+            frame.split('\n').forEach(line => {
+                if (line.startsWith('event: '))     event = line.slice(7);
+                else if (line.startsWith('data: ')) data += line.slice(6);
+            });
+            onEvent(event, data ? JSON.parse(data) : {});
+        }
+    }
+}
+
 function showError(msg) {
     const el = document.getElementById('errorBox');
     el.textContent = '// ERROR: ' + msg;
@@ -2110,48 +2753,190 @@ document.addEventListener('keydown', e => {
 </html>
 """
 
+# The page has no template variables, so it is encoded and compressed once at
+# import instead of going through Jinja on every GET. Brotli at quality 11 is
+# slow but only runs here; browsers that support it get the smallest payload.
+INDEX_BYTES = HTML_TEMPLATE.encode('utf-8')
+INDEX_BR    = brotli.compress(INDEX_BYTES, quality=11)
+INDEX_GZ    = gzip.compress(INDEX_BYTES, 9)
+INDEX_ETAG  = hashlib.blake2b(INDEX_BYTES, digest_size=8).hexdigest()
+
 @app.route('/')
 def index():
-    return render_template_string(HTML_TEMPLATE)
+    # Parsed, not substring-matched, so "br;q=0" counts as a refusal
+    accepted = request.accept_encodings
+    # Each encoding is a different byte sequence, so each gets its own strong ETag
+    if accepted.quality('br') > 0:
+        response = Response(INDEX_BR, mimetype='text/html')
+        response.headers['Content-Encoding'] = 'br'
+        etag = f"{INDEX_ETAG}-br"
+    elif accepted.quality('gzip') > 0:
+        response = Response(INDEX_GZ, mimetype='text/html')
+        response.headers['Content-Encoding'] = 'gzip'
+        etag = f"{INDEX_ETAG}-gz"
+    else:
+        response = Response(INDEX_BYTES, mimetype='text/html')
+        etag = INDEX_ETAG
+    response.headers['Vary'] = 'Accept-Encoding'
+    # Revalidate on every load (UI changes show up immediately) but answer
+    # repeat visits with a body-less 304 via the ETag
+    response.headers['Cache-Control'] = 'no-cache'
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+def engines_configured() -> bool:
+    """True if keys.txt configured at least one LLM engine."""
+    return bool(api_keys) and bool(gemini_model or openai_client or openrouter_client)
+
+
+def server_error(e: Exception) -> Response:
+    """Logs an unexpected route failure and returns the generic 500 response."""
+    print(f"{Fore.RED}Server error: {e}")
+    return json_response({"error": "Internal server error."}, 500)
+
+
+def parse_analysis_request(batch: bool = False):
+    """
+    Shared front half of /analyze, /analyze_stream and /batch_analyze: checks an
+    engine is configured, parses the JSON body and validates the URL(s).
+    Returns (target, ai_choice, None) on success — target is the clean 'url', or
+    the list of clean 'urls' when batch=True — else (None, None, error_response).
+    """
+    if not engines_configured():
+        return None, None, json_response({"error": "Server not configured with a valid API key."}, 500)
+    try:
+        data = orjson.loads(request.get_data())
+        ai_choice = data.get('ai_choice', 'both')
+
+        if not batch:
+            # Server-side URL validation + prompt injection check
+            is_valid, clean_url, val_error = validate_and_sanitize_url(data.get('url', '').strip())
+            if not is_valid:
+                return None, None, json_response({"error": val_error}, 400)
+            return clean_url, ai_choice, None
+
+        raw_urls = data.get('urls')
+        if not isinstance(raw_urls, list) or not raw_urls:
+            return None, None, json_response({"error": "'urls' must be a non-empty list of URLs."}, 400)
+        if len(raw_urls) > MAX_BATCH_URLS:
+            return None, None, json_response({"error": f"Too many URLs — maximum is {MAX_BATCH_URLS} per batch."}, 400)
+
+        # Same server-side validation as /analyze, applied to every URL
+        urls = []
+        for i, raw_url in enumerate(raw_urls, start=1):
+            is_valid, clean_url, val_error = validate_and_sanitize_url(raw_url)
+            if not is_valid:
+                return None, None, json_response({"error": f"URL #{i}: {val_error}"}, 400)
+            urls.append(clean_url)
+        return urls, ai_choice, None
+    except Exception as e:
+        return None, None, server_error(e)
+
 
 @app.route('/analyze', methods=['POST'])
 def analyze():
-    if not api_keys or (not gemini_model and not openai_client and not openrouter_client):
-        return jsonify({"error": "Server not configured with a valid API key."}), 500
+    url, ai_choice, error = parse_analysis_request()
+    if error:
+        return error
     try:
-        data = request.get_json()
-        raw_url = data.get('url', '').strip()
-        ai_choice = data.get('ai_choice', 'both')
+        response_data, status_code = run_in_background_loop(
+            perform_analysis(url, ai_choice, AI_SYSTEM_PROMPT)
+        )
+        return json_response(response_data, status_code)
+    except Exception as e:
+        return server_error(e)
+
+@app.route('/analyze_stream', methods=['POST'])
+def analyze_stream():
+    """
+    Same analysis as /analyze, streamed as server-sent events so the UI can show
+    the intel cards and each verdict as soon as they exist. See stream_analysis
+    for the event types.
+    """
+    url, ai_choice, error = parse_analysis_request()
+    if error:
+        return error
+
+    # The analysis runs on the background loop; events cross back to this
+    # request thread through a thread-safe queue. None marks the end.
+    events = queue.Queue()
+    future = asyncio.run_coroutine_threadsafe(
+        stream_analysis(url, ai_choice, AI_SYSTEM_PROMPT, lambda event, payload: events.put((event, payload))),
+        get_background_loop(),
+    )
+    future.add_done_callback(lambda _: events.put(None))
+
+    def generate():
+        try:
+            while True:
+                item = events.get()
+                if item is None:
+                    break
+                event, payload = item
+                yield f"event: {event}\ndata: {orjson.dumps(payload).decode()}\n\n"
+        finally:
+            # Client went away early — stop spending LLM calls on it
+            future.cancel()
+
+    return Response(
+        generate(),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
 
-        # Server-side URL validation + prompt injection check
-        is_valid, clean_url, val_error = validate_and_sanitize_url(raw_url)
-        if not is_valid:
-            return jsonify({"error": val_error}), 400
-        url = clean_url
-        response_data, status_code = asyncio.run(perform_analysis(url, ai_choice, AI_SYSTEM_PROMPT))
-        return jsonify(response_data), status_code
+
+@app.route('/batch_analyze', methods=['POST'])
+def batch_analyze():
+    urls, ai_choice, error = parse_analysis_request(batch=True)
+    if error:
+        return error
+    try:
+        response_data, status_code = run_in_background_loop(
+            perform_analysis_batch(urls, ai_choice, AI_SYSTEM_PROMPT)
+        )
+        return json_response(response_data, status_code)
     except Exception as e:
-        print(f"{Fore.RED}Server error: {e}")
-        return jsonify({"error": "Internal server error."}), 500
+        return server_error(e)
 
 
 # ==============================================================================
 # CLI BANNER + STARTUP
 # ==============================================================================
 
-def print_cli_banner():
-    print(Style.BRIGHT)
-    banner_text = pyfiglet.figlet_format("ARYPHISH_DETECTOR", font="slant")
-    print(f"{Fore.CYAN}{banner_text}")
-    print(f"{Fore.YELLOW}Made By Aryan Giri — v2.0 (Web Search Edition)\n{Style.RESET_ALL}")
-    print(f"{Fore.CYAN}[ MODULES LOADED ]{Style.RESET_ALL}")
-    print(f"  {Fore.GREEN}✓ Combo-Squatting & Typosquatting Detector")
-    print(f"  {Fore.GREEN}✓ WHOIS Domain Registration Lookup")
-    print(f"  {Fore.GREEN}✓ DuckDuckGo Search Intelligence (free, no key)")
-    print(f"  {Fore.GREEN}✓ Brand Validation Cross-Reference")
-    print(f"  {Fore.GREEN}✓ Async Dual-AI Analysis (Gemini + ChatGPT)")
-    print()
-    if not api_keys or (not gemini_model and not openai_client and not openrouter_client):
+# pyfiglet.figlet_format("ARYPHISH_DETECTOR", font="slant"), rendered once and
+# inlined — saves loading pyfiglet and its font file on every (re)start
+BANNER_TEXT = r"""
+    ___    ______  ______  __  ___________ __  __     ____  __________________
+   /   |  / __ \ \/ / __ \/ / / /  _/ ___// / / /    / __ \/ ____/_  __/ ____/
+  / /| | / /_/ /\  / /_/ / /_/ // / \__ \/ /_/ /    / / / / __/   / / / __/
+ / ___ |/ _, _/ / / ____/ __  // / ___/ / __  /    / /_/ / /___  / / / /___
+/_/  |_/_/ |_| /_/_/   /_/ /_/___//____/_/ /_/____/_____/_____/ /_/ /_____/
+                                            /_____/
+   ________________  ____
+  / ____/_  __/ __ \/ __ \
+ / /     / / / / / / /_/ /
+/ /___  / / / /_/ / _, _/
+\____/ /_/  \____/_/ |_|
+"""
+
+
+def print_cli_banner(quiet: bool = False):
+    """
+    Prints the startup banner and engine status. Returns False if no engine is
+    configured. quiet=True (--quiet) skips the art and module list.
+    """
+    if not quiet:
+        print(Style.BRIGHT)
+        print(f"{Fore.CYAN}{BANNER_TEXT}")
+        print(f"{Fore.YELLOW}Made By Aryan Giri — v2.0 (Web Search Edition)\n{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}[ MODULES LOADED ]{Style.RESET_ALL}")
+        print(f"  {Fore.GREEN}✓ Combo-Squatting & Typosquatting Detector")
+        print(f"  {Fore.GREEN}✓ WHOIS Domain Registration Lookup")
+        print(f"  {Fore.GREEN}✓ DuckDuckGo Search Intelligence (free, no key)")
+        print(f"  {Fore.GREEN}✓ Brand Validation Cross-Reference")
+        print(f"  {Fore.GREEN}✓ Async Dual-AI Analysis (Gemini + ChatGPT)")
+        print()
+    if not engines_configured():
         print(f"{Fore.RED}Error: At least one API key required in keys.txt")
         return False
     if gemini_model:
@@ -2173,5 +2958,7 @@ def print_cli_banner():
 
 
 if __name__ == '__main__':
-    if print_cli_banner():
-        app.run(debug=True, host='127.0.0.1', port=5000)
+    if print_cli_banner(quiet='--quiet' in sys.argv[1:]):
+        # Each request thread only waits on the shared background loop, so
+        # concurrent analyses overlap their network and LLM waits there.
+        app.run(debug=True, host='127.0.0.1', port=5000, threaded=True)